@@ -1,6 +1,6 @@
 import configparser
+import functools
 import logging
-import os
 
 # Basic logging setup for the config manager itself
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -11,13 +11,13 @@ CONFIG_FILE = 'config.ini'
 def load_config():
     """Loads configuration from the config.ini file."""
     config = configparser.ConfigParser()
-    if not os.path.exists(CONFIG_FILE):
-        log.error(f"Configuration file '{CONFIG_FILE}' not found.")
-        # Create a default config file? Or raise error? For now, error.
-        raise FileNotFoundError(f"Configuration file '{CONFIG_FILE}' not found.")
 
     try:
-        config.read(CONFIG_FILE)
+        # Open directly instead of an os.path.exists pre-check: one syscall
+        # fewer and no check-then-open race. (config.read would silently
+        # ignore a missing file, so read from the file object.)
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
+            config.read_file(f)
         log.info(f"Configuration loaded successfully from '{CONFIG_FILE}'.")
 
         # Basic validation/defaults can be added here if needed
@@ -32,23 +32,47 @@ def load_config():
 
         return config
 
+    except FileNotFoundError:
+        log.error(f"Configuration file '{CONFIG_FILE}' not found.")
+        # Create a default config file? Or raise error? For now, error.
+        raise
     except configparser.Error as e:
         log.error(f"Error parsing configuration file '{CONFIG_FILE}': {e}")
         raise
 
-# Load config once when the module is imported
-try:
-    config = load_config()
-except Exception as e:
-    log.critical(f"Failed to load configuration. Exiting. Error: {e}")
-    # In a real app, might exit here, but for simplicity, let it continue
-    # so other modules can be imported, though they might fail later.
-    config = None # Indicate config failed to load
+# Config is loaded lazily on the first getter call rather than at import time,
+# so importing this module (or anything that imports it) doesn't pay the parse
+# cost until a setting is actually needed.
+_config = None
+_load_attempted = False
+
+def _get_config():
+    """Returns the parsed config, loading it on first access."""
+    global _config, _load_attempted
+    if not _load_attempted:
+        _load_attempted = True
+        try:
+            _config = load_config()
+        except Exception as e:
+            log.critical(f"Failed to load configuration. Error: {e}")
+            # Leave _config as None so getters fall back gracefully,
+            # mirroring the old import-time behaviour.
+            _config = None
+    return _config
+
+def __getattr__(name):
+    # Keep the historical module attribute 'config' working (e.g. the
+    # 'cfg.config is None' sanity check in main_shopper).
+    if name == 'config':
+        return _get_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # --- Helper functions to access config values easily ---
 
+@functools.lru_cache(maxsize=None)
 def get_general_setting(key, fallback=None):
     """Gets a setting from the [General] section."""
+    config = _get_config()
     if not config: return fallback
     try:
         return config.get('General', key)
@@ -56,8 +80,10 @@ def get_general_setting(key, fallback=None):
         log.warning(f"Setting '[General]/{key}' not found in config. Returning fallback: {fallback}")
         return fallback
 
+@functools.lru_cache(maxsize=None)
 def get_int_setting(section, key, fallback=0):
     """Gets an integer setting from a specified section."""
+    config = _get_config()
     if not config: return fallback
     try:
         return config.getint(section, key)
@@ -65,8 +91,10 @@ def get_int_setting(section, key, fallback=0):
         log.warning(f"Integer setting '[{section}]/{key}' not found or invalid. Returning fallback: {fallback}")
         return fallback
 
+@functools.lru_cache(maxsize=None)
 def get_float_setting(section, key, fallback=0.0):
     """Gets a float setting from a specified section."""
+    config = _get_config()
     if not config: return fallback
     try:
         return config.getfloat(section, key)
@@ -74,8 +102,10 @@ def get_float_setting(section, key, fallback=0.0):
          log.warning(f"Float setting '[{section}]/{key}' not found or invalid. Returning fallback: {fallback}")
          return fallback
 
+@functools.lru_cache(maxsize=None)
 def get_api_key(key, fallback=None):
     """Gets a setting from the [APIKeys] section."""
+    config = _get_config()
     if not config: return fallback
     # Optionally integrate python-dotenv here to check environment variables first
     # import os
@@ -88,21 +118,25 @@ def get_api_key(key, fallback=None):
         log.debug(f"API Key '[APIKeys]/{key}' not found in config.")
         return fallback
 
+@functools.lru_cache(maxsize=None)
 def get_enabled_platforms():
-    """Gets the list of enabled platforms."""
-    if not config: return []
+    """Gets the enabled platforms as a tuple (hashable, so the result caches)."""
+    config = _get_config()
+    if not config: return ()
     try:
         platforms_str = config.get('Platforms', 'enabled_platforms', fallback='')
         # Split by newline, strip whitespace, filter out empty lines/comments
-        platforms = [p.strip() for p in platforms_str.splitlines() if p.strip() and not p.strip().startswith(';')]
+        platforms = tuple(p.strip() for p in platforms_str.splitlines() if p.strip() and not p.strip().startswith(';'))
         log.info(f"Enabled platforms: {platforms}")
         return platforms
     except (configparser.NoSectionError, configparser.NoOptionError):
         log.warning("'[Platforms]/enabled_platforms' section/key not found. No platforms enabled.")
-        return []
+        return ()
 
+@functools.lru_cache(maxsize=None)
 def get_scraping_setting(key, fallback=None):
     """Gets a setting from the [Scraping] section."""
+    config = _get_config()
     if not config: return fallback
     try:
         return config.get('Scraping', key)
@@ -110,10 +144,19 @@ def get_scraping_setting(key, fallback=None):
         log.warning(f"Setting '[Scraping]/{key}' not found in config. Returning fallback: {fallback}")
         return fallback
 
+def reload_config():
+    """Re-reads config.ini and clears the cached getter results."""
+    global _config, _load_attempted
+    _config = load_config()
+    _load_attempted = True
+    for getter in (get_general_setting, get_int_setting, get_float_setting,
+                   get_api_key, get_enabled_platforms, get_scraping_setting):
+        getter.cache_clear()
+
 if __name__ == '__main__':
     # Example usage if run directly
     print("Loading config for testing...")
-    if config:
+    if _get_config():
         print(f"Input File: {get_general_setting('input_file')}")
         print(f"Output File: {get_general_setting('output_file')}")
         print(f"Interval (min): {get_int_setting('General', 'schedule_interval_minutes')}")
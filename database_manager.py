@@ -1,13 +1,113 @@
+import atexit
+import queue
 import sqlite3
 import logging
 import os
+from contextlib import contextmanager
 from datetime import datetime
 
-# Import config getter
-from config_manager import get_general_setting
+# Import config getters
+from config_manager import get_general_setting, get_int_setting
 
 log = logging.getLogger(__name__)
 
+# --- Connection Tuning ---
+# PRAGMAs applied to every connection. WAL lets readers run while a write is in
+# progress, synchronous=NORMAL drops the per-commit fsync count (safe with WAL),
+# and the rest keep temp data and the page cache in memory.
+_TUNING_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA temp_store=memory;
+PRAGMA cache_size=-20000;
+PRAGMA busy_timeout=5000;
+"""
+
+def _connect(db_path):
+    """Opens a SQLite connection with the standard tuning PRAGMAs applied.
+
+    isolation_level=None puts the connection in autocommit mode so that
+    transactions are controlled explicitly (BEGIN IMMEDIATE / COMMIT) where
+    batching matters.
+    """
+    # check_same_thread=False because the connection is created at init time
+    # but used from the scheduler's worker thread; access is serialized by the
+    # single-job scheduler.
+    conn = sqlite3.connect(db_path, isolation_level=None,
+                           detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                           timeout=10.0, check_same_thread=False)
+    conn.executescript(_TUNING_PRAGMAS)
+    return conn
+
+# --- Singleton Write Connection ---
+# Reopening a connection per call throws away SQLite's page cache and WAL
+# state on every scheduled cycle; keep one long-lived writer instead.
+_conn = None
+
+def get_conn():
+    """Returns the shared write connection, creating it lazily."""
+    global _conn
+    if _conn is None:
+        db_path = get_general_setting('database_file', 'results.db')
+        _conn = _connect(db_path)
+    return _conn
+
+# --- Read Connection Pool ---
+# In WAL mode readers never block the writer (and vice versa), so queries like
+# get_recent_results go through a small pool of read-only connections instead
+# of queueing behind the writer.
+_READ_POOL_SIZE = os.cpu_count() or 4
+_read_pool = None
+
+# Read-side subset of the tuning PRAGMAs: journal_mode/synchronous only matter
+# for writers and cannot be changed on a mode=ro connection.
+_READ_PRAGMAS = """
+PRAGMA temp_store=memory;
+PRAGMA cache_size=-20000;
+PRAGMA busy_timeout=5000;
+"""
+
+def _open_ro(db_path):
+    """Opens a read-only connection (URI mode=ro) with read-side PRAGMAs."""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True,
+                           detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES,
+                           timeout=10.0, check_same_thread=False)
+    conn.executescript(_READ_PRAGMAS)
+    return conn
+
+def _get_read_pool():
+    global _read_pool
+    if _read_pool is None:
+        db_path = get_general_setting('database_file', 'results.db')
+        pool = queue.Queue(maxsize=_READ_POOL_SIZE)
+        for _ in range(_READ_POOL_SIZE):
+            pool.put(_open_ro(db_path))
+        _read_pool = pool
+    return _read_pool
+
+@contextmanager
+def read_conn():
+    """Context manager yielding a pooled read-only connection."""
+    pool = _get_read_pool()
+    conn = pool.get()
+    try:
+        yield conn
+    finally:
+        pool.put(conn)
+
+def _close_conn():
+    """Closes all connections (registered via atexit for clean shutdown)."""
+    global _conn, _read_pool
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+    if _read_pool is not None:
+        while not _read_pool.empty():
+            _read_pool.get_nowait().close()
+        _read_pool = None
+
+atexit.register(_close_conn)
+
 # --- Database Initialization ---
 def init_db():
     """Initializes the database and creates the listings table if it doesn't exist."""
@@ -24,16 +124,25 @@ def init_db():
     #         log.error(f"Failed to create directory {db_dir}: {e}")
     #         return # Cannot proceed if directory fails
 
-    conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES, timeout=10.0)
     try:
         # Connect (creates the file if it doesn't exist)
-        conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-        cursor = conn.cursor()
+        conn = get_conn()
 
-        # SQL to create table - Using TEXT for flexibility, REAL for numbers
-        # UNIQUE constraint on 'link' helps prevent exact duplicate entries
-        # Added search_term and found_timestamp columns
-        create_table_sql = """
+        # Whole schema in one executescript call: a single prepare/execute
+        # round trip instead of one per statement (executescript commits
+        # implicitly, so no separate commit is needed).
+        #
+        # Table notes: TEXT for flexibility, REAL for numbers; the UNIQUE
+        # constraint on 'link' prevents exact duplicate entries.
+        #
+        # Indexes are matched to the expected query patterns. The composite
+        # index covers "recent results per platform per search term" in one
+        # probe (separate single-column indexes on platform/search_term would
+        # force the planner to pick one and filter the rest). idx_ts_desc
+        # keeps the plain ORDER BY found_timestamp DESC LIMIT query
+        # index-only. ANALYZE gathers stats once so the planner prefers the
+        # composite index.
+        conn.executescript("""
         CREATE TABLE IF NOT EXISTS listings (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             platform TEXT NOT NULL,
@@ -44,25 +153,23 @@ def init_db():
             link TEXT UNIQUE,
             found_timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
         );
-        """
-        cursor.execute(create_table_sql)
 
-        # Optional: Add indexes for faster querying later
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_price ON listings (price);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_platform ON listings (platform);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_search_term ON listings (search_term);")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON listings (found_timestamp);")
+        CREATE INDEX IF NOT EXISTS idx_price ON listings (price);
+        CREATE INDEX IF NOT EXISTS idx_plat_term_ts ON listings (platform, search_term, found_timestamp DESC);
+        CREATE INDEX IF NOT EXISTS idx_ts_desc ON listings (found_timestamp DESC);
 
+        -- Superseded single-column indexes from older databases; dropping
+        -- them stops their B-tree maintenance on every insert
+        DROP INDEX IF EXISTS idx_platform;
+        DROP INDEX IF EXISTS idx_search_term;
 
-        conn.commit()
+        ANALYZE;
+        """)
         log.info("Database initialized successfully. 'listings' table ensured.")
 
     except sqlite3.Error as e:
         log.critical(f"CRITICAL: Database initialization failed: {e}", exc_info=True)
         raise
-    finally:
-        if conn:
-            conn.close()
 
 # --- Saving Results ---
 def save_results(results):
@@ -71,8 +178,6 @@ def save_results(results):
         log.info("No results to save to database.")
         return
 
-    db_path = get_general_setting('database_file', 'results.db')
-    conn = None
     inserted_count = 0
     ignored_count = 0
 
@@ -84,67 +189,80 @@ def save_results(results):
     """
     # Note: found_timestamp uses the default value
 
+    # Prepare data tuples matching the SQL placeholders.
+    # 'item' from the result dict holds the search term; None values become NULL.
+    rows = [
+        (
+            result.get('platform'),
+            result.get('item'),
+            result.get('title'),
+            result.get('price'),
+            result.get('seller_rating'),
+            result.get('link')
+        )
+        for result in results
+    ]
+
+    conn = get_conn()
     try:
-        conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES, timeout=10.0)
         cursor = conn.cursor()
 
-        for result in results:
-            # Prepare data tuple matching the SQL placeholders
-            data_tuple = (
-                result.get('platform'),
-                result.get('item'), # 'item' from the result dict holds the search term
-                result.get('title'),
-                result.get('price'),
-                result.get('seller_rating'), # Handles None correctly (becomes NULL)
-                result.get('link')
-            )
-
-            try:
-                cursor.execute(insert_sql, data_tuple)
-                # cursor.rowcount is 1 if inserted, 0 if ignored (due to unique link)
-                if cursor.rowcount > 0:
-                    inserted_count += 1
-                else:
-                    # Check if link was the reason for ignore (it should be)
-                    if result.get('link'):
-                        ignored_count += 1
-                    else: # If link was None, something else happened, log it.
-                       log.warning(f"Row ignore without link for title: {result.get('title')}")
-
-            except sqlite3.Error as e:
-                log.warning(f"Failed to insert row for '{result.get('title', 'N/A')}': {e}")
-                # Optionally skip this row or handle differently
-
-        conn.commit() # Commit all changes at once
+        # Pre-filter links that already exist in the table. On a mature
+        # database most scraped links recur between cycles, so skipping them
+        # up front avoids the per-row conflict check inside the index insert.
+        # Chunked to stay well under SQLite's bound-parameter limit.
+        links = [row[5] for row in rows if row[5]]
+        existing = set()
+        select_chunk = 500
+        for i in range(0, len(links), select_chunk):
+            chunk = links[i:i + select_chunk]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"SELECT link FROM listings WHERE link IN ({placeholders});", chunk)
+            existing.update(row[0] for row in cursor.fetchall())
+
+        new_rows = [row for row in rows if row[5] not in existing]
+        ignored_count = len(rows) - len(new_rows)
+
+        if new_rows:
+            # Insert in bounded chunks, each inside its own IMMEDIATE
+            # transaction (writer lock taken up front, avoiding SQLITE_BUSY
+            # mid-batch). Chunking keeps the peak WAL size bounded and lets
+            # checkpoints interleave instead of one megacommit stalling
+            # readers. INSERT OR IGNORE stays as a safety net in case a link
+            # appears twice within the batch itself.
+            chunk_size = get_int_setting('Database', 'insert_chunk_size', 1000)
+            for i in range(0, len(new_rows), chunk_size):
+                batch = new_rows[i:i + chunk_size]
+                conn.execute("BEGIN IMMEDIATE")
+                cursor.executemany(insert_sql, batch)
+                conn.commit()
+
+                affected = max(cursor.rowcount, 0)
+                inserted_count += affected
+                ignored_count += len(batch) - affected
         log.info(f"Database save complete. Inserted: {inserted_count}, Ignored (duplicate link): {ignored_count}")
 
     except sqlite3.Error as e:
+        # Roll back the explicit transaction so the shared connection is left clean
+        conn.rollback()
         log.error(f"Database error during save: {e}", exc_info=True)
-    finally:
-        if conn:
-            conn.close()
 
 # --- Optional: Basic Query Function (Example) ---
 def get_recent_results(limit=10):
     """Example function to retrieve the most recently found results."""
-    db_path = get_general_setting('database_file', 'results.db')
-    conn = None
     try:
-        conn = sqlite3.connect(db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
-        conn.row_factory = sqlite3.Row # Return results as dictionary-like rows
-        cursor = conn.cursor()
+        with read_conn() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row # Return results as dictionary-like rows
 
-        query_sql = "SELECT * FROM listings ORDER BY found_timestamp DESC LIMIT ?;"
-        cursor.execute(query_sql, (limit,))
-        rows = cursor.fetchall()
-        return [dict(row) for row in rows] # Convert rows to standard dicts
+            query_sql = "SELECT * FROM listings ORDER BY found_timestamp DESC LIMIT ?;"
+            cursor.execute(query_sql, (limit,))
+            rows = cursor.fetchall()
+            return [dict(row) for row in rows] # Convert rows to standard dicts
 
     except sqlite3.Error as e:
         log.error(f"Database error fetching recent results: {e}", exc_info=True)
         return []
-    finally:
-        if conn:
-            conn.close()
 
 if __name__ == '__main__':
     # Example usage if run directly
@@ -1,58 +1,92 @@
 import json
 import logging
-import os
+from typing import NamedTuple
+
+import ijson
 
 log = logging.getLogger(__name__)
 
+class SearchItem(NamedTuple):
+    """One validated entry from the input file.
+
+    A NamedTuple instead of a plain dict: downstream loops access
+    item.name/item.max_price thousands of times per cycle, and attribute
+    access on a NamedTuple is an index load rather than a hash probe.
+    Unrecognized keys from the input file are preserved in 'extras'.
+    """
+    name: str
+    max_price: float
+    min_seller_rating: float
+    extras: dict
+
+    def to_dict(self):
+        """Dict form for consumers that still expect the raw item mapping."""
+        return {**self.extras,
+                'name': self.name,
+                'max_price': self.max_price,
+                'min_seller_rating': self.min_seller_rating}
+
 def read_input_file(file_path):
     """
     Reads the JSON input file containing items to search for.
 
+    The top-level array is streamed with ijson rather than materialized via
+    f.read() + json.loads, so memory stays constant regardless of file size
+    and each item is validated as it is parsed.
+
     Args:
         file_path (str): The path to the input JSON file.
 
     Returns:
-        list: A list of dictionaries, where each dictionary represents an item.
+        list: A list of SearchItem records, one per valid input entry.
               Returns an empty list if the file is not found, empty, or invalid.
     """
-    if not os.path.exists(file_path):
-        log.error(f"Input file not found: {file_path}")
-        return []
-
+    # No separate existence check: open() raising FileNotFoundError avoids the
+    # extra stat call and the check-then-open race.
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            # Handle potentially empty file
-            if not content.strip():
+        with open(file_path, 'rb') as f:
+            # Handle potentially empty file (ijson would report it as
+            # incomplete JSON, which deserves a clearer message)
+            if not f.read(1):
                 log.warning(f"Input file is empty: {file_path}")
                 return []
-            data = json.loads(content)
-            if not isinstance(data, list):
-                log.error(f"Input file does not contain a valid JSON list: {file_path}")
-                return []
-            log.info(f"Successfully read {len(data)} items from {file_path}")
-            # Basic validation of item structure (optional but recommended)
+            f.seek(0)
+
+            # Basic validation of item structure, fused with the parse loop;
+            # each valid entry becomes a typed SearchItem record
             valid_items = []
-            for i, item in enumerate(data):
+            for i, item in enumerate(ijson.items(f, 'item')):
                 if isinstance(item, dict) and 'name' in item and 'max_price' in item:
                      # Ensure max_price is a number, default min_seller_rating if missing
                     try:
-                        item['max_price'] = float(item['max_price'])
+                        max_price = float(item['max_price'])
                     except (ValueError, TypeError):
                          log.warning(f"Item {i} in {file_path} has invalid 'max_price'. Skipping.")
                          continue
-                    item.setdefault('min_seller_rating', 0) # Default to 0 if missing
                     try:
-                         item['min_seller_rating'] = float(item['min_seller_rating'])
+                         min_seller_rating = float(item.get('min_seller_rating', 0) or 0)
                     except (ValueError, TypeError):
                         log.warning(f"Item {i} in {file_path} has invalid 'min_seller_rating'. Using 0.")
-                        item['min_seller_rating'] = 0.0
-                    valid_items.append(item)
+                        min_seller_rating = 0.0
+                    extras = {k: v for k, v in item.items()
+                              if k not in ('name', 'max_price', 'min_seller_rating')}
+                    valid_items.append(SearchItem(name=item['name'],
+                                                  max_price=max_price,
+                                                  min_seller_rating=min_seller_rating,
+                                                  extras=extras))
                 else:
                     log.warning(f"Skipping invalid item structure at index {i} in {file_path}")
+
+            if not valid_items:
+                log.error(f"Input file does not contain a valid JSON list of items: {file_path}")
+            else:
+                log.info(f"Successfully read {len(valid_items)} items from {file_path}")
             return valid_items
 
-    except json.JSONDecodeError as e:
+    except FileNotFoundError:
+        log.error(f"Input file not found: {file_path}")
+        return []
+    except (ijson.JSONError, json.JSONDecodeError) as e:
         log.error(f"Error decoding JSON from {file_path}: {e}")
         return []
     except Exception as e:
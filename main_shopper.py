@@ -2,9 +2,7 @@ import logging
 import datetime
 import time
 import sys
-import config_manager as cfg
-import input_processor
-from importlib import import_module # To dynamically import platform modules
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from apscheduler.schedulers.blocking import BlockingScheduler
 from apscheduler.triggers.interval import IntervalTrigger
@@ -14,24 +12,19 @@ import config_manager as cfg
 import input_processor
 # import output_generator
 import database_manager
-from platform_modules.base_platform import BasePlatform # For type hinting/checking
-
-# --- Logging Setup ---
-log_level_str = cfg.get_general_setting('log_level', 'INFO').upper()
-log_level = getattr(logging, log_level_str, logging.INFO)
-logging.basicConfig(level=log_level,
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-                    datefmt='%Y-%m-%d %H:%M:%S')
-# Silence overly verbose libraries if needed
-logging.getLogger("requests").setLevel(logging.WARNING)
-logging.getLogger("urllib3").setLevel(logging.WARNING)
-logging.getLogger("apscheduler").setLevel(logging.INFO)
+from platform_modules import PLATFORM_REGISTRY
 
+# Logging is configured in the __main__ guard below so importing this module
+# (tests, tooling) doesn't configure root logging or force a config load.
 log = logging.getLogger("main_shopper")
 
 # --- Platform Module Loading ---
 def load_platform_modules():
-    """Dynamically loads enabled platform modules."""
+    """Instantiates enabled platforms from the pre-built registry.
+
+    The import/getattr/issubclass work happens once, at platform_modules
+    import time; this is just a dict filter by the enabled names.
+    """
     platforms = {}
     enabled_platform_names = cfg.get_enabled_platforms()
     if not enabled_platform_names:
@@ -39,29 +32,16 @@ def load_platform_modules():
         return platforms
 
     for name in enabled_platform_names:
-        module_name = f"platform_modules.{name}_module"
-        class_name = f"{name.capitalize()}Platform" # Assumes ClassName format
+        platform_class = PLATFORM_REGISTRY.get(name)
+        if platform_class is None:
+            log.error(f"Platform '{name}' is enabled in config.ini but not in the registry (module missing or failed to import). Skipping.")
+            continue
         try:
-            print(f"Attempting to import {module_name}...") # Add print statement
-            module = import_module(module_name)
-            print(f"Successfully imported {module_name}.") # Add success print
-            
-            platform_class = getattr(module, class_name)
-            # Ensure it's a subclass of BasePlatform
-            if issubclass(platform_class, BasePlatform):
-                 platforms[name] = platform_class() # Instantiate the class
-                 log.info(f"Successfully loaded platform module: {name}")
-            else:
-                 log.error(f"Class '{class_name}' in '{module_name}' does not inherit from BasePlatform. Skipping.")
-
-        # --- MODIFICATION START ---
-        # Catch specific ImportError and print more details
-        except ImportError as e:
-            log.error(f"ImportError importing module '{module_name}': {e}. Check file existence and dependencies. Skipping platform '{name}'.", exc_info=True)
-        # except AttributeError:
-        #    log.error(f"Could not find class '{class_name}' in module '{module_name}'. Check class naming. Skipping platform '{name}'.")
-        except Exception as e: # Catch other potential errors during import/getattr
-             log.error(f"Error loading platform module '{name}' (module='{module_name}', class='{class_name}'): {e}", exc_info=True) # Add exc_info=True 
+            platforms[name] = platform_class() # Instantiate the class
+            log.info(f"Successfully loaded platform module: {name}")
+        except Exception as e:
+            log.error(f"Error instantiating platform '{name}': {e}", exc_info=True)
+
     if not platforms:
         log.error("No platform modules loaded successfully. Check configuration and logs.")
 
@@ -87,34 +67,63 @@ def run_search_cycle(platform_instances):
         return
 
     # 2. Search Platforms
+    # Each (item, platform) search is an independent, network-bound HTTP
+    # round-trip, so fan them out across a thread pool instead of running
+    # them back to back. Cycle wall time drops from the sum of per-search
+    # latencies to roughly the slowest one (modulo pool size).
     all_results = []
+    seen_links = set() # Cross-platform/search dedupe by listing URL
+    # Could add search term variations here using search_enhancer
+    # search_terms = search_enhancer.get_search_variations(item['name'])
+    # For now, just use the original name.
+    # Coalesce duplicate (platform, query) pairs up front: an item listed
+    # twice in the input with the same constraints fires one search per
+    # platform instead of N identical round-trips.
+    seen_tasks = set()
+    tasks = []
     for item in items_to_search:
-        log.info(f"--- Processing item: {item['name']} ---")
-        # Could add search term variations here using search_enhancer
-        # search_terms = search_enhancer.get_search_variations(item['name'])
-        # For now, just use the original name:
-        current_search_term = item['name']
-
         for platform_name, platform_obj in platform_instances.items():
-            log.info(f"Searching on {platform_name}...")
+            task_key = (platform_name, item.name, item.max_price, item.min_seller_rating)
+            if task_key in seen_tasks:
+                log.debug(f"Skipping duplicate search task: {task_key}")
+                continue
+            seen_tasks.add(task_key)
+            tasks.append((item, platform_name, platform_obj))
+
+    max_workers = cfg.get_int_setting('Scraping', 'max_workers', 8)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Platforms still take the raw item mapping, so hand them the dict view
+        future_to_task = {
+            executor.submit(platform_obj.search, item.to_dict()): (item, platform_name)
+            for item, platform_name, platform_obj in tasks
+        }
+        for future in as_completed(future_to_task):
+            item, platform_name = future_to_task[future]
+            current_search_term = item.name
             try:
-                platform_results = platform_obj.search(item) # Pass the whole item dict
+                platform_results = future.result()
                 if platform_results:
                     log.info(f"Found {len(platform_results)} results on {platform_name} for '{current_search_term}'.")
-                    all_results.extend(platform_results)
+                    # Drop listings already collected in this cycle (e.g. the
+                    # same product surfacing under two search terms) so the
+                    # save path doesn't re-check them against the database
+                    for listing in platform_results:
+                        if listing.link in seen_links:
+                            continue
+                        seen_links.add(listing.link)
+                        all_results.append(listing)
                 else:
                     log.info(f"No results found on {platform_name} for '{current_search_term}'.")
             except Exception as e:
                 log.error(f"Platform '{platform_name}' failed during search for '{current_search_term}': {e}", exc_info=True)
-            # Optional: Add extra delay between platforms if needed
-            # time.sleep(cfg.get_float_setting('Scraping', 'delay_between_platforms_seconds', 1.0))
 
 
     # 3. Write Output
     log.info(f"Total results found across all platforms: {len(all_results)}")
     # log.info(f"Attempting to write output to: '{output_file}' (Type: {type(output_file)})") # DEBUG LINE
     # output_generator.write_output_file(output_file, all_results)
-    database_manager.save_results(all_results)
+    # Listings stay as slotted records until this external boundary
+    database_manager.save_results([listing.to_dict() for listing in all_results])
 
     end_time = time.time()
     log.info(f"Search cycle finished in {end_time - start_time:.2f} seconds.")
@@ -122,6 +131,17 @@ def run_search_cycle(platform_instances):
 
 # --- Scheduler Setup and Main Execution ---
 if __name__ == "__main__":
+    # --- Logging Setup ---
+    log_level_str = cfg.get_general_setting('log_level', 'INFO').upper()
+    log_level = getattr(logging, log_level_str, logging.INFO)
+    logging.basicConfig(level=log_level,
+                        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+    # Silence overly verbose libraries if needed
+    logging.getLogger("requests").setLevel(logging.WARNING)
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+    logging.getLogger("apscheduler").setLevel(logging.INFO)
+
     log.info("Initializing AI Shopping Assistant...")
 
     if cfg.config is None:
@@ -3,6 +3,11 @@ import logging
 import os
 from datetime import datetime # Ensure datetime is imported
 
+try:
+    import orjson # Much faster serializer, emits bytes directly
+except ImportError:
+    orjson = None # Fall back to stdlib json
+
 log = logging.getLogger(__name__)
 
 def write_output_file(file_path, results):
@@ -32,8 +37,14 @@ def write_output_file(file_path, results):
         # --- ADDED Debug Log right before open ---
         log.info(f"Attempting to open and write to: '{os.path.abspath(file_path)}'") # Log absolute path
 
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=4, ensure_ascii=False)
+        if orjson is not None:
+            # orjson serializes straight to bytes, skipping the large
+            # intermediate unicode buffer json.dump builds
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(output_data, f, indent=4, ensure_ascii=False)
 
         log.info(f"Successfully wrote {len(results)} results to {file_path}")
 
@@ -1,9 +1,41 @@
 # This file makes Python treat the 'platform_modules' directory as a package.
-# It can also be used to expose module elements at the package level if desired.
+# It builds the platform registry once at import time so callers don't have to
+# repeat the import_module/getattr/issubclass dance on every load.
 
-# Example: from .ebay_module import EbayPlatform
-# This allows 'from platform_modules import EbayPlatform'
+import logging
+from importlib import import_module
 
-# For simplicity now, keep it empty or just list available modules for info.
-AVAILABLE_MODULES = ['ebay_module', 'amazon_module', 'walmart_module', 'bestbuy_module']
-print(f"Platform modules available: {', '.join(AVAILABLE_MODULES)}")
+from .base_platform import BasePlatform
+
+log = logging.getLogger(__name__)
+
+# Maps config platform name -> platform class. Populated once below; platforms
+# whose module fails to import (e.g. missing optional dependency) are skipped
+# with a log entry instead of breaking the whole package.
+PLATFORM_REGISTRY = {}
+
+_KNOWN_PLATFORMS = [
+    ('ebay', 'ebay_module', 'EbayPlatform'),
+    ('amazon', 'amazon_module', 'AmazonPlatform'),
+    ('walmart', 'walmart_module', 'WalmartPlatform'),
+    ('bestbuy', 'bestbuy_module', 'BestbuyPlatform'),
+]
+
+def _register(name, module_name, class_name):
+    try:
+        module = import_module(f".{module_name}", __name__)
+        platform_class = getattr(module, class_name)
+    except ImportError as e:
+        log.warning(f"Platform module '{module_name}' could not be imported ({e}). Platform '{name}' unavailable.")
+        return
+    except AttributeError:
+        log.error(f"Could not find class '{class_name}' in module '{module_name}'. Platform '{name}' unavailable.")
+        return
+
+    if issubclass(platform_class, BasePlatform):
+        PLATFORM_REGISTRY[name] = platform_class
+    else:
+        log.error(f"Class '{class_name}' in '{module_name}' does not inherit from BasePlatform. Platform '{name}' unavailable.")
+
+for _name, _module_name, _class_name in _KNOWN_PLATFORMS:
+    _register(_name, _module_name, _class_name)
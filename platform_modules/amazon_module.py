@@ -3,7 +3,7 @@ from urllib.parse import quote_plus
 import re # For extracting price from complex strings
 
 # Ensure these imports are correct relative to this file's location
-from .base_platform import BasePlatform
+from .base_platform import BasePlatform, Listing
 # from search_enhancer import check_title_relevance # Optional relevance check
 
 log = logging.getLogger(__name__)
@@ -13,15 +13,21 @@ AMAZON_SEARCH_URL_TEMPLATE = "https://www.amazon.com/s?k={query}"
 
 # --- Selectors (EXTREMELY LIKELY TO BREAK - These are examples ONLY) ---
 RESULT_ITEM_SELECTOR = "div[data-component-type='s-search-result']"
-TITLE_SELECTOR = "h2 a span.a-text-normal"
+TITLE_SELECTOR = "span.a-text-normal" # Relative to the title/link anchor
 PRICE_WHOLE_SELECTOR = "span.a-price-whole"
 PRICE_FRACTION_SELECTOR = "span.a-price-fraction"
 LINK_SELECTOR = "h2 a.a-link-normal"
+SPONSORED_SELECTOR = 'span[data-component-type="s-ads-indicator-text"]'
+PRICE_FALLBACK_SELECTOR = "span.a-price > span.a-offscreen"
 
 # --- Ensure class name is exactly AmazonPlatform ---
 class AmazonPlatform(BasePlatform):
     """Amazon search implementation (using scraping - unstable)."""
 
+    # Hoisted prefix for absolutizing relative hrefs; two-operand + concat
+    # is cheaper than an f-string per listing
+    _BASE_URL = "https://www.amazon.com"
+
     def __init__(self):
         super().__init__("Amazon")
         log.warning("[Amazon] Scraping Amazon is highly unreliable and may be blocked or return incorrect results. Selectors need frequent updates.")
@@ -41,81 +47,98 @@ class AmazonPlatform(BasePlatform):
         if not response:
             return []
 
-        if "captcha" in response.text.lower() or "robot check" in response.text.lower():
+        if self._is_blocked(response):
              log.error("[Amazon] Blocked by CAPTCHA or robot check. Scraping failed.")
              # Consider adding response.url to the log to see where it redirected
              log.debug(f"[Amazon] Blocked URL: {response.url}")
              return []
 
-        soup = self._parse_html(response.text)
-        if not soup:
+        if not self._worth_parsing(response):
+            return []
+
+        # Same body + same filters (e.g. served by the response cache or a
+        # 304 revalidation) -> reuse the previously parsed listings
+        cache_key = self._parsed_cache_key(response, item)
+        cached_results = self._get_parsed_results(cache_key)
+        if cached_results is not None:
+            return cached_results
+
+        tree = self._parse_html(response.content)
+        if not tree:
             return []
 
         results = []
-        list_items = soup.select(RESULT_ITEM_SELECTOR)
+        list_items = tree.css(RESULT_ITEM_SELECTOR)
         log.info(f"[Amazon] Found {len(list_items)} potential listings on page using selector '{RESULT_ITEM_SELECTOR}'.")
 
         if not list_items:
              log.warning(f"[Amazon] No items found using selector '{RESULT_ITEM_SELECTOR}'. Amazon structure might have changed, or you might be blocked.")
 
-        for list_item in list_items:
+        # Drop Ad / Sponsored placements in one pre-pass (these often have
+        # different structures). The selector needs verification by
+        # inspecting Amazon's HTML for ads.
+        organic_items = [li for li in list_items if not li.css_first(SPONSORED_SELECTOR)]
+        if len(organic_items) < len(list_items):
+            log.debug(f"[Amazon] Skipping {len(list_items) - len(organic_items)} sponsored listings.")
+
+        for list_item in organic_items:
             try:
-                # Check if it's an Ad / Sponsored item first (these often have different structures)
-                # This selector needs verification by inspecting Amazon's HTML for ads
-                sponsored_label = list_item.select_one('span[data-component-type="s-ads-indicator-text"]')
-                if sponsored_label:
-                     log.debug("[Amazon] Skipping sponsored listing.")
-                     continue
-
-                title_element = list_item.select_one(TITLE_SELECTOR)
-                link_element = list_item.select_one(LINK_SELECTOR)
-                price_whole_el = list_item.select_one(PRICE_WHOLE_SELECTOR)
-                price_fraction_el = list_item.select_one(PRICE_FRACTION_SELECTOR)
-
-                title = title_element.get_text(strip=True) if title_element else "N/A"
-                link = None
-                if link_element and link_element.has_attr('href'):
-                    href = link_element['href']
-                    # Basic check to form absolute URL
-                    if href.startswith('/'):
-                        link = f"https://www.amazon.com{href}"
-                    elif href.startswith('http'):
-                        link = href
-                    # Add more checks if needed based on observed URL patterns
+                # Extract and check the price first: for overpriced listings
+                # (often most of the page) this skips the title/link text
+                # extraction and record construction entirely
+                price_whole_el = list_item.css_first(PRICE_WHOLE_SELECTOR)
+                price_fraction_el = list_item.css_first(PRICE_FRACTION_SELECTOR)
 
                 price = None
                 if price_whole_el and price_fraction_el:
                     # Ensure we extract only digits and decimal point if needed
-                    price_str = f"{price_whole_el.get_text(strip=True)}{price_fraction_el.get_text(strip=True)}"
+                    price_str = f"{price_whole_el.text(strip=True)}{price_fraction_el.text(strip=True)}"
                     price = self._clean_price(price_str)
                 else:
                     # Sometimes price might be in a single element, try finding that as a fallback
                     # Example: Look for elements with class 'a-price' containing 'a-offscreen'
-                    price_container = list_item.select_one('span.a-price > span.a-offscreen')
+                    price_container = list_item.css_first(PRICE_FALLBACK_SELECTOR)
                     if price_container:
-                        price = self._clean_price(price_container.get_text(strip=True))
+                        price = self._clean_price(price_container.text(strip=True))
 
+                if price is None or price > max_price:
+                    log.debug(f"[Amazon] Skipping item (price): {price} (Max: {max_price})")
+                    continue
+
+                # Title and link share the same h2 anchor: find the anchor
+                # once and pull the title span from its subtree
+                link_element = list_item.css_first(LINK_SELECTOR)
+                title_element = link_element.css_first(TITLE_SELECTOR) if link_element else None
+
+                title = title_element.text(strip=True) if title_element else "N/A"
+                link = None
+                href = link_element.attributes.get('href') if link_element else None
+                if href:
+                    # Basic check to form absolute URL
+                    if href[0] == '/':
+                        link = self._BASE_URL + href
+                    elif href.startswith('http'):
+                        link = href
+                    # Add more checks if needed based on observed URL patterns
 
                 # Skip if essential data is missing after trying to parse
-                if title == "N/A" or price is None or link is None:
-                    log.debug(f"[Amazon] Skipping item due to missing data: Title='{title}', Price={price}, Link={link}")
+                if title == "N/A" or link is None:
+                    log.debug(f"[Amazon] Skipping item due to missing data: Title='{title}', Link={link}")
                     continue
 
-                result = {
-                    "platform": self.platform_name,
-                    "item": search_term,
-                    "title": title,
-                    "price": price,
-                    "seller_rating": None, # Not reliably available
-                    "link": link
-                }
-
-                if self._apply_filters(result, item):
-                     results.append(result)
+                results.append(Listing(
+                    platform=self.platform_name,
+                    item=search_term,
+                    title=title,
+                    price=price,
+                    seller_rating=None, # Not reliably available
+                    link=link
+                ))
 
             except Exception as e:
                 log.warning(f"[Amazon] Error processing a listing item: {e}", exc_info=False)
                 continue
 
         log.info(f"[Amazon] Found {len(results)} relevant listings for '{search_term}' after filtering.")
+        self._store_parsed_results(cache_key, results)
         return results
\ No newline at end of file
@@ -1,23 +1,131 @@
+import hashlib
 import logging
+import re
+import threading
 import time
 import requests
 from abc import ABC, abstractmethod
-from bs4 import BeautifulSoup
+from dataclasses import dataclass
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
+from urllib3.util.retry import Retry
+from selectolax.lexbor import LexborHTMLParser
 
 # Import config settings needed by platforms
 from config_manager import get_scraping_setting, get_float_setting, get_api_key
 
 log = logging.getLogger(__name__)
 
+# Block/interstitial detection run on the raw response bytes. One compiled
+# case-insensitive regex pass over response.content replaces the old
+# '"captcha" in response.text.lower()' style checks, which each allocated a
+# full lowercased copy of the HTML before parsing even started.
+_BLOCK_RE = re.compile(rb'captcha|robot check|access denied|are you a human', re.I)
+
+# Empty-result page markers, also checked on the raw bytes so a "no results"
+# page never pays for a full HTML parse. The lookbehind keeps the zero-count
+# marker from substring-matching larger counts like "2,000 results for".
+_NO_RESULTS_RE = re.compile(rb'no results found|did not match any products|(?<!\d)0 results for', re.I)
+
+# Real search result pages are far larger than this; blocked or interstitial
+# pages are usually tiny
+_MIN_PARSEABLE_BYTES = 5000
+
+# Currency/noise stripping for price strings, compiled once: a regex sub runs
+# in C, unlike the per-character filter(lambda ...) it replaces. Called once
+# per listing across every platform.
+_PRICE_RE = re.compile(r'[^\d.]+')
+
+# One Session shared by every platform instance: keep-alive sockets to the
+# same hosts/CDN edges are reused across platforms and worker threads, and
+# the enlarged adapter pool avoids redoing TCP+TLS handshakes (~100-300ms
+# each) on repeated searches. Session.get is thread-safe for our usage.
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+def _get_shared_session():
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20,
+                                  max_retries=Retry(total=2, backoff_factor=0.3))
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _shared_session = session
+    return _shared_session
+
+@dataclass(slots=True)
+class Listing:
+    """A single found listing.
+
+    A slots dataclass is several times smaller per record than the
+    six-key dict it replaces and attribute access skips the per-key
+    hashing, which adds up when a cycle collects thousands of listings.
+    """
+    platform: str
+    item: str
+    title: str
+    price: float
+    seller_rating: float
+    link: str
+
+    def to_dict(self):
+        """Dict view for the storage/output boundary (database, JSON)."""
+        return {
+            "platform": self.platform, "item": self.item,
+            "title": self.title, "price": self.price,
+            "seller_rating": self.seller_rating, "link": self.link,
+        }
+
+
+class _CachedResponse:
+    """Lightweight stand-in for a requests.Response served from the cache."""
+    __slots__ = ('text', 'content', 'url', 'status_code')
+
+    def __init__(self, text, content, url, status_code):
+        self.text = text
+        self.content = content
+        self.url = url
+        self.status_code = status_code
+
+
 class BasePlatform(ABC):
     """Abstract Base Class for all platform search modules."""
 
+    # Short-TTL cache of successful responses keyed by (platform, url,
+    # params). Re-running the same watchlist inside the TTL skips the fetch
+    # (and the rate-limit delay) entirely, which also avoids hammering sites
+    # into CAPTCHA territory on quick successive runs. Entries keep the
+    # server's ETag/Last-Modified validators so stale entries can be
+    # revalidated with a conditional request instead of a full refetch.
+    _response_cache = {} # key -> (expires_at, _CachedResponse, etag, last_modified)
+    _response_cache_lock = threading.Lock()
+    _RESPONSE_CACHE_MAX = 512
+
+    # Parsed-results cache. Extracting Listings from a response body is
+    # pure given (body, filter params), so the output is memoized by a
+    # body hash: when the TTL cache or a 304 revalidation serves the same
+    # bytes again, the CSS selection / JSON decoding / record building is
+    # skipped entirely.
+    _parsed_cache = {} # key -> [Listing, ...]
+    _parsed_cache_lock = threading.Lock()
+    _PARSED_CACHE_MAX = 256
+
+    # Per-host request pacing, shared across all platform instances and
+    # worker threads. Each host gets its own minimum-interval limiter keyed
+    # by netloc, so the delay is only paid when two requests to the *same*
+    # host land too close together — a fixed pre-request sleep double-pays
+    # on slow responses and throttles unrelated hosts for no reason.
+    _host_limiters = {}
+    _host_limiters_lock = threading.Lock()
+
     def __init__(self, platform_name):
         self.platform_name = platform_name
         self.timeout = get_float_setting('Scraping', 'request_timeout_seconds', 10.0)
         self.delay = get_float_setting('Scraping', 'delay_between_requests_seconds', 2.0)
         self.headers = {'User-Agent': get_scraping_setting('User-Agent', 'Mozilla/5.0')}
-        self.session = requests.Session() # Use session for potential cookie handling, connection reuse
+        self.session = _get_shared_session() # Shared pooled session for cookie handling, connection reuse
         self.session.headers.update(self.headers)
 
     @abstractmethod
@@ -30,20 +138,87 @@ class BasePlatform(ABC):
                          'name', 'max_price', 'min_seller_rating'.
 
         Returns:
-            list: A list of dictionaries, where each dictionary represents a
-                  found listing matching the output format:
-                  {'platform', 'item', 'title', 'price', 'seller_rating', 'link'}
+            list: A list of Listing records, one per found listing.
                   Returns an empty list if no results found or an error occurs.
         """
         pass
 
+    def _throttle(self, url):
+        """Blocks until a request to url's host respects the per-host interval."""
+        if self.delay <= 0:
+            return
+        netloc = urlparse(url).netloc
+        with BasePlatform._host_limiters_lock:
+            limiter = BasePlatform._host_limiters.get(netloc)
+            if limiter is None:
+                limiter = {'lock': threading.Lock(), 'next_at': 0.0}
+                BasePlatform._host_limiters[netloc] = limiter
+        # Holding the host lock while sleeping intentionally serializes
+        # same-host callers; different hosts proceed in parallel.
+        with limiter['lock']:
+            now = time.monotonic()
+            wait = limiter['next_at'] - now
+            if wait > 0:
+                time.sleep(wait)
+                now = time.monotonic()
+            limiter['next_at'] = now + self.delay
+
     def _make_request(self, url, params=None):
-        """Helper method to make HTTP GET requests with error handling and delay."""
-        time.sleep(self.delay) # Respectful delay before each request
+        """Helper method to make HTTP GET requests with error handling, rate limiting and caching."""
+        cache_key = (self.platform_name, url,
+                     tuple(sorted(params.items())) if params else None)
+        ttl = get_float_setting('Scraping', 'response_cache_ttl_seconds', 600.0)
+
+        entry = None
+        if ttl > 0:
+            with BasePlatform._response_cache_lock:
+                entry = BasePlatform._response_cache.get(cache_key)
+                if entry and entry[0] > time.monotonic():
+                    log.debug(f"[{self.platform_name}] Response cache hit for {url}")
+                    return entry[1]
+
+        # Stale entry with validators: ask the server whether the page
+        # actually changed. A 304 costs headers only — no body transfer,
+        # no server-side render — and lets us serve the cached copy.
+        conditional_headers = None
+        if entry:
+            conditional_headers = {}
+            if entry[2]:
+                conditional_headers['If-None-Match'] = entry[2]
+            if entry[3]:
+                conditional_headers['If-Modified-Since'] = entry[3]
+            conditional_headers = conditional_headers or None
+
+        self._throttle(url) # Respectful per-host pacing
         try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
+            response = self.session.get(url, params=params, timeout=self.timeout,
+                                        headers=conditional_headers)
+            if response.status_code == 304 and entry:
+                log.debug(f"[{self.platform_name}] 304 Not Modified for {url}, serving revalidated cache entry")
+                with BasePlatform._response_cache_lock:
+                    BasePlatform._response_cache[cache_key] = (
+                        time.monotonic() + ttl, entry[1], entry[2], entry[3])
+                return entry[1]
             response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
             log.debug(f"Successfully fetched URL: {response.url}")
+
+            if ttl > 0:
+                cached = _CachedResponse(response.text, response.content,
+                                         response.url, response.status_code)
+                with BasePlatform._response_cache_lock:
+                    cache = BasePlatform._response_cache
+                    if len(cache) >= BasePlatform._RESPONSE_CACHE_MAX:
+                        # Drop expired entries first; if that frees nothing,
+                        # drop the soonest-to-expire (oldest) entry
+                        now = time.monotonic()
+                        for key in [k for k, v in cache.items() if v[0] <= now]:
+                            del cache[key]
+                        if len(cache) >= BasePlatform._RESPONSE_CACHE_MAX:
+                            del cache[min(cache, key=lambda k: cache[k][0])]
+                    cache[cache_key] = (time.monotonic() + ttl, cached,
+                                        response.headers.get('ETag'),
+                                        response.headers.get('Last-Modified'))
+
             return response
         except requests.exceptions.RequestException as e:
             log.error(f"[{self.platform_name}] Request failed for {url}: {e}")
@@ -52,12 +227,68 @@ class BasePlatform(ABC):
             log.error(f"[{self.platform_name}] An unexpected error occurred during request to {url}: {e}")
             return None
 
+    def _parsed_cache_key(self, response, item):
+        """Cache key for the listings parsed out of a response body.
+
+        blake2b over the raw bytes is far cheaper than re-parsing; the
+        filter parameters are part of the key because they shape which
+        listings survive extraction.
+        """
+        digest = hashlib.blake2b(response.content, digest_size=16).digest()
+        return (self.platform_name, digest,
+                item['max_price'], item.get('min_seller_rating'))
+
+    def _get_parsed_results(self, cache_key):
+        """Returns a copy of cached listings for cache_key, or None."""
+        with BasePlatform._parsed_cache_lock:
+            cached = BasePlatform._parsed_cache.get(cache_key)
+        if cached is not None:
+            log.debug(f"[{self.platform_name}] Parsed-results cache hit")
+            return list(cached)
+        return None
+
+    def _store_parsed_results(self, cache_key, results):
+        """Caches the listings parsed for cache_key (FIFO-bounded)."""
+        with BasePlatform._parsed_cache_lock:
+            cache = BasePlatform._parsed_cache
+            if len(cache) >= BasePlatform._PARSED_CACHE_MAX and cache_key not in cache:
+                del cache[next(iter(cache))]
+            cache[cache_key] = list(results)
+
+    def _is_blocked(self, response):
+        """Checks the raw bytes for CAPTCHA/robot-check/access-denied markers."""
+        return bool(_BLOCK_RE.search(response.content))
+
+    def _worth_parsing(self, response):
+        """Cheap pre-parse triage on the raw bytes.
+
+        Returns False when the page is too small to be a real results page
+        or declares that nothing matched, so the failure path skips the
+        full HTML parse entirely.
+        """
+        if len(response.content) < _MIN_PARSEABLE_BYTES:
+            log.warning(f"[{self.platform_name}] Response suspiciously small ({len(response.content)} bytes). Skipping parse.")
+            return False
+        if _NO_RESULTS_RE.search(response.content):
+            log.info(f"[{self.platform_name}] Page reports no matching results. Skipping parse.")
+            return False
+        return True
+
     def _parse_html(self, html_content):
-        """Helper method to parse HTML content using BeautifulSoup."""
+        """Helper method to parse HTML content into a selectolax tree.
+
+        Lexbor is a C HTML5 engine, roughly an order of magnitude faster
+        than BeautifulSoup with 'html.parser' on full search result pages.
+        Nodes expose .css()/.css_first(), .text(strip=True) and .attributes.
+
+        Accepts bytes or str; callers should pass response.content so the
+        engine decodes directly from the wire bytes instead of parsing
+        requests' already-decoded (and ~2x larger) text copy.
+        """
         if not html_content:
             return None
         try:
-            return BeautifulSoup(html_content, 'html.parser') # Or 'lxml' if installed & preferred
+            return LexborHTMLParser(html_content)
         except Exception as e:
             log.error(f"[{self.platform_name}] Error parsing HTML: {e}")
             return None
@@ -68,7 +299,7 @@ class BasePlatform(ABC):
             return None
         try:
             # Remove currency symbols, commas, and whitespace
-            cleaned = ''.join(filter(lambda x: x.isdigit() or x == '.', str(price_str).strip()))
+            cleaned = _PRICE_RE.sub('', str(price_str).strip())
             if cleaned:
                 return float(cleaned)
             return None
@@ -76,15 +307,3 @@ class BasePlatform(ABC):
             log.warning(f"[{self.platform_name}] Could not parse price: {price_str}")
             return None
 
-    def _apply_filters(self, result, item):
-         """Helper method to apply common filters (price). Specific filters (rating) in subclasses."""
-         if not result or not isinstance(result, dict):
-             return False
-
-         # Price filter (mandatory)
-         if result.get('price') is None or result['price'] > item['max_price']:
-             log.debug(f"[{self.platform_name}] Filtering out item (price): {result.get('title')} @ {result.get('price')} (Max: {item['max_price']})")
-             return False
-
-         # Base implementation assumes other filters are handled by subclasses or not applicable
-         return True
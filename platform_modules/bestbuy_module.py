@@ -1,8 +1,8 @@
 import logging
 from urllib.parse import quote_plus
-import json # Best Buy also sometimes uses embedded JSON
+import orjson # Best Buy also sometimes uses embedded JSON; orjson decodes it 2-3x faster
 
-from .base_platform import BasePlatform
+from .base_platform import BasePlatform, Listing
 
 log = logging.getLogger(__name__)
 
@@ -24,6 +24,10 @@ LINK_SELECTOR_BB = "h4.sku-title a" # Link is often on the title
 class BestbuyPlatform(BasePlatform):
     """Best Buy search implementation (using scraping - unstable)."""
 
+    # Hoisted prefix for absolutizing relative hrefs; two-operand + concat
+    # is cheaper than an f-string per listing
+    _BASE_URL = "https://www.bestbuy.com"
+
     def __init__(self):
         super().__init__("BestBuy")
         log.warning("[BestBuy] Scraping Best Buy is unreliable and may be blocked. Use with caution.")
@@ -43,22 +47,40 @@ class BestbuyPlatform(BasePlatform):
             return []
 
         # Check for common blocking patterns if needed
-        if "Access Denied" in response.text:
+        if self._is_blocked(response):
             log.error("[BestBuy] Access Denied. Scraping likely blocked.")
             return []
 
-        soup = self._parse_html(response.text)
-        if not soup:
+        if not self._worth_parsing(response):
+            return []
+
+        # Same body + same filters (e.g. served by the response cache or a
+        # 304 revalidation) -> reuse the previously parsed listings
+        cache_key = self._parsed_cache_key(response, item)
+        cached_results = self._get_parsed_results(cache_key)
+        if cached_results is not None:
+            return cached_results
+
+        tree = self._parse_html(response.content)
+        if not tree:
             return []
 
         results = []
 
         # --- Strategy 1: Try embedded LD+JSON (often used for SEO) ---
         found_json = False
-        scripts = soup.select(SCRIPT_SELECTOR_BB)
+        scripts = tree.css(SCRIPT_SELECTOR_BB)
         for script in scripts:
             try:
-                data = json.loads(script.text)
+                # deep=False grabs the single text node without walking
+                # descendants/concatenating — scripts have no child tags
+                script_text = script.text(deep=False)
+                # Cheap substring gate: most LD+JSON blocks are
+                # WebSite/Organization/BreadcrumbList schemas. Skip them
+                # before paying to decode tens of KB of JSON.
+                if '"Product"' not in script_text and '"ItemList"' not in script_text:
+                    continue
+                data = orjson.loads(script_text)
                 # Check if it's a product list or individual product schema
                 if isinstance(data, list): # Often a list of product schemas
                      items_data = data
@@ -75,35 +97,38 @@ class BestbuyPlatform(BasePlatform):
                          if item_data.get('@type') != 'Product': continue
 
                          try:
-                             title = item_data.get('name')
+                             # Price gate first: overpriced items skip the
+                             # link absolutization and record construction
                              offers = item_data.get('offers', {})
                              if isinstance(offers, list): # Sometimes offers is a list
                                 offers = offers[0] if offers else {}
 
                              price = self._clean_price(offers.get('price'))
+                             if price is None or price > max_price:
+                                 continue
+
+                             title = item_data.get('name')
                              link = item_data.get('url')
 
-                             if not title or price is None or not link:
+                             if not title or not link:
                                  continue
 
                              # Ensure link is absolute
                              if link and not link.startswith('http'):
-                                link = f"https://www.bestbuy.com{link}" if link.startswith('/') else f"https://www.bestbuy.com/{link}"
+                                link = self._BASE_URL + link if link[0] == '/' else self._BASE_URL + '/' + link
 
 
-                             result = {
-                                 "platform": self.platform_name, "item": search_term,
-                                 "title": title, "price": price,
-                                 "seller_rating": None, "link": link
-                             }
-                             if self._apply_filters(result, item):
-                                 results.append(result)
+                             results.append(Listing(
+                                 platform=self.platform_name, item=search_term,
+                                 title=title, price=price,
+                                 seller_rating=None, link=link
+                             ))
 
                          except Exception as e:
                              log.warning(f"[BestBuy] Error processing item from JSON-LD data: {e}")
                      found_json = True
                      # Don't break here, there might be multiple LD+JSON blocks
-            except json.JSONDecodeError:
+            except orjson.JSONDecodeError:
                 continue
             except Exception as e:
                 log.error(f"[BestBuy] Error processing script tag (LD+JSON): {e}")
@@ -111,7 +136,7 @@ class BestbuyPlatform(BasePlatform):
         # --- Strategy 2: Direct HTML scraping (fallback) ---
         if not found_json: # Only run if JSON method yielded no results
             log.warning("[BestBuy] Embedded JSON-LD data not found or failed to parse. Falling back to direct HTML scraping.")
-            list_items = soup.select(RESULT_ITEM_SELECTOR_BB)
+            list_items = tree.css(RESULT_ITEM_SELECTOR_BB)
             log.info(f"[BestBuy] Found {len(list_items)} potential listings via HTML selectors.")
 
             if not list_items and not found_json:
@@ -119,37 +144,41 @@ class BestbuyPlatform(BasePlatform):
 
             for list_item in list_items:
                 try:
-                    title_element = list_item.select_one(TITLE_SELECTOR_BB)
-                    price_element = list_item.select_one(PRICE_SELECTOR_BB)
-                    link_element = list_item.select_one(LINK_SELECTOR_BB) # Same as title link usually
-
-                    title = title_element.get_text(strip=True) if title_element else "N/A"
-                    link = None
-                    if link_element and link_element.has_attr('href'):
-                         href = link_element['href']
-                         link = f"https://www.bestbuy.com{href}" if not href.startswith('http') else href
+                    price_element = list_item.css_first(PRICE_SELECTOR_BB)
 
                     price = None
                     if price_element:
-                        price_str = price_element.get_text(strip=True)
+                        price_str = price_element.text(strip=True)
                         price = self._clean_price(price_str)
 
-                    if title == "N/A" or price is None or link is None:
-                        log.debug(f"[BestBuy] Skipping item due to missing data (HTML scrape): Title={title}, Price={price}, Link={link}")
+                    # Price gate before title/link extraction
+                    if price is None or price > max_price:
+                        log.debug(f"[BestBuy] Skipping item (price): {price} (Max: {max_price})")
                         continue
 
-                    result = {
-                        "platform": self.platform_name, "item": search_term,
-                        "title": title, "price": price,
-                        "seller_rating": None, "link": link
-                    }
+                    title_element = list_item.css_first(TITLE_SELECTOR_BB)
+                    link_element = title_element # LINK_SELECTOR_BB is the same node; no second traversal
+
+                    title = title_element.text(strip=True) if title_element else "N/A"
+                    link = None
+                    href = link_element.attributes.get('href') if link_element else None
+                    if href:
+                         link = href if href.startswith('http') else self._BASE_URL + href
+
+                    if title == "N/A" or link is None:
+                        log.debug(f"[BestBuy] Skipping item due to missing data (HTML scrape): Title={title}, Link={link}")
+                        continue
 
-                    if self._apply_filters(result, item):
-                         results.append(result)
+                    results.append(Listing(
+                        platform=self.platform_name, item=search_term,
+                        title=title, price=price,
+                        seller_rating=None, link=link
+                    ))
 
                 except Exception as e:
                     log.warning(f"[BestBuy] Error processing a listing item (HTML scrape): {e}", exc_info=False)
                     continue
 
         log.info(f"[BestBuy] Found {len(results)} relevant listings for '{search_term}' after filtering.")
+        self._store_parsed_results(cache_key, results)
         return results
@@ -1,8 +1,9 @@
 import logging
+import re
 from urllib.parse import quote_plus # For URL encoding search terms
 
 # Ensure these imports are correct relative to this file's location
-from .base_platform import BasePlatform
+from .base_platform import BasePlatform, Listing
 from config_manager import get_api_key # To potentially use API keys later
 # Import the fuzzy matching utility if needed for title relevance
 from search_enhancer import check_title_relevance
@@ -21,6 +22,9 @@ PRICE_SELECTOR = "span.s-item__price"
 LINK_SELECTOR = "a.s-item__link"
 SELLER_INFO_SELECTOR = "span.s-item__seller-info-text"
 
+# Extracts the numeric part of a "99.8% positive" style rating in one pass
+_RATING_RE = re.compile(r'([\d.]+)%')
+
 # --- Ensure class name is exactly EbayPlatform ---
 class EbayPlatform(BasePlatform):
     """eBay search implementation (using scraping as fallback/example)."""
@@ -46,71 +50,81 @@ class EbayPlatform(BasePlatform):
         if not response:
             return []
 
-        soup = self._parse_html(response.text)
-        if not soup:
+        # Same body + same filters (e.g. served by the response cache or a
+        # 304 revalidation) -> reuse the previously parsed listings
+        cache_key = self._parsed_cache_key(response, item)
+        cached_results = self._get_parsed_results(cache_key)
+        if cached_results is not None:
+            return cached_results
+
+        tree = self._parse_html(response.content)
+        if not tree:
             return []
 
         results = []
         # Make sure RESULT_ITEM_SELECTOR is correct for current eBay layout
-        list_items = soup.select(RESULT_ITEM_SELECTOR)
+        list_items = tree.css(RESULT_ITEM_SELECTOR)
         # Check if the selector is finding anything
         if not list_items:
             log.warning(f"[eBay] No items found using selector '{RESULT_ITEM_SELECTOR}'. Check eBay's HTML structure.")
             # Try alternative selectors if needed, e.g., based on data attributes
-            # list_items = soup.select('div.s-item__wrapper') # Example alternative
+            # list_items = tree.css('div.s-item__wrapper') # Example alternative
 
         log.info(f"[eBay] Found {len(list_items)} potential listings on page using selector '{RESULT_ITEM_SELECTOR}'.")
 
 
         for list_item in list_items:
             try:
-                title_element = list_item.select_one(TITLE_SELECTOR)
-                price_element = list_item.select_one(PRICE_SELECTOR)
-                link_element = list_item.select_one(LINK_SELECTOR)
+                title_element = list_item.css_first(TITLE_SELECTOR)
+                price_element = list_item.css_first(PRICE_SELECTOR)
+                link_element = list_item.css_first(LINK_SELECTOR)
+
+                price_str = price_element.text(strip=True) if price_element else ""
+                price = self._clean_price(price_str.split(' to ')[0]) # Take the lower price if range
+
+                # Price gate before any further extraction: overpriced
+                # listings skip the title/rating/link work entirely
+                if price is None or price > max_price:
+                    log.debug(f"[eBay] Skipping item (price): {price} (Max: {max_price})")
+                    continue
 
                 # Robust check for elements before accessing attributes/text
                 title = "N/A"
                 if title_element:
                     # Sometimes title is inside the link text itself
-                    title_text = title_element.get_text(strip=True)
+                    title_text = title_element.text(strip=True)
                     if not title_text and link_element: # Fallback to link text
-                        title_text = link_element.get_text(strip=True)
+                        title_text = link_element.text(strip=True)
                     title = title_text.replace('New Listing', '').strip()
 
-                price_str = price_element.get_text(strip=True) if price_element else ""
-                price = self._clean_price(price_str.split(' to ')[0]) # Take the lower price if range
-
-                link = link_element['href'] if link_element and link_element.has_attr('href') else None
+                link = link_element.attributes.get('href') if link_element else None
 
-                seller_info_element = list_item.select_one(SELLER_INFO_SELECTOR)
+                seller_info_element = list_item.css_first(SELLER_INFO_SELECTOR)
                 seller_rating = None
                 if seller_info_element:
-                     seller_text = seller_info_element.get_text(strip=True)
-                     if '%' in seller_text:
+                     seller_text = seller_info_element.text(strip=True)
+                     match = _RATING_RE.search(seller_text)
+                     if match:
                          try:
-                             rating_part = seller_text.split('%')[0].split()[-1]
-                             # Handle potential non-numeric values before conversion
-                             cleaned_rating_part = ''.join(filter(lambda x: x.isdigit() or x == '.', rating_part))
-                             if cleaned_rating_part:
-                                 seller_rating = float(cleaned_rating_part)
-                         except (ValueError, IndexError, TypeError):
+                             seller_rating = float(match.group(1))
+                         except ValueError:
                              log.debug(f"[eBay] Could not parse seller rating from: {seller_text}")
 
 
-                if title == "N/A" or price is None or link is None:
-                    log.debug(f"[eBay] Skipping item due to missing data: Title='{title}', Price={price}, Link={link}")
+                if title == "N/A" or link is None:
+                    log.debug(f"[eBay] Skipping item due to missing data: Title='{title}', Link={link}")
                     continue
 
-                result = {
-                    "platform": self.platform_name,
-                    "item": search_term,
-                    "title": title,
-                    "price": price,
-                    "seller_rating": seller_rating,
-                    "link": link
-                }
+                result = Listing(
+                    platform=self.platform_name,
+                    item=search_term,
+                    title=title,
+                    price=price,
+                    seller_rating=seller_rating,
+                    link=link
+                )
 
-                if self._apply_filters(result, item) and self._apply_ebay_filters(result, item):
+                if self._apply_ebay_filters(result, item):
                     results.append(result)
 
             except Exception as e:
@@ -118,6 +132,7 @@ class EbayPlatform(BasePlatform):
                 continue
 
         log.info(f"[eBay] Found {len(results)} relevant listings for '{search_term}' after filtering.")
+        self._store_parsed_results(cache_key, results)
         return results
 
     def _apply_ebay_filters(self, result, item):
@@ -125,8 +140,8 @@ class EbayPlatform(BasePlatform):
         min_rating = item.get('min_seller_rating', 0) # Use .get for safety
         if min_rating > 0:
             # Ensure seller_rating is not None before comparison
-            current_rating = result.get('seller_rating')
+            current_rating = result.seller_rating
             if current_rating is None or current_rating < min_rating:
-                log.debug(f"[eBay] Filtering out item (rating): {result.get('title')} Rating: {current_rating} (Min: {min_rating}%)")
+                log.debug(f"[eBay] Filtering out item (rating): {result.title} Rating: {current_rating} (Min: {min_rating}%)")
                 return False
         return True
@@ -1,8 +1,8 @@
 import logging
 from urllib.parse import quote_plus
-import json # Walmart sometimes embeds data in JSON within script tags
+import orjson # Walmart embeds large JSON blobs; orjson decodes them 2-4x faster
 
-from .base_platform import BasePlatform
+from .base_platform import BasePlatform, Listing
 
 log = logging.getLogger(__name__)
 
@@ -25,6 +25,10 @@ LINK_SELECTOR = "a[link-identifier]" # Example, find actual link element
 class WalmartPlatform(BasePlatform):
     """Walmart search implementation (using scraping - unstable)."""
 
+    # Hoisted prefix for absolutizing relative hrefs; two-operand + concat
+    # is cheaper than an f-string per listing
+    _BASE_URL = "https://www.walmart.com"
+
     def __init__(self):
         super().__init__("Walmart")
         log.warning("[Walmart] Scraping Walmart is unreliable and may be blocked. Use with caution.")
@@ -49,98 +53,155 @@ class WalmartPlatform(BasePlatform):
              log.error(f"[Walmart] Received status {response.status_code} or redirected to error page. Scraping failed.")
              return []
 
-        soup = self._parse_html(response.text)
-        if not soup:
-            return []
+        # Same body + same filters (e.g. served by the response cache or a
+        # 304 revalidation) -> reuse the previously parsed listings
+        cache_key = self._parsed_cache_key(response, item)
+        cached_results = self._get_parsed_results(cache_key)
+        if cached_results is not None:
+            return cached_results
 
         results = []
+        tree = None
 
         # --- Strategy 1: Look for embedded JSON data (preferred if found) ---
+        # Fast path: locate the payload by substring search on the raw page
+        # and slice that one <script> body out directly. When it hits, the
+        # HTML tree is never built and the dozens of unrelated JSON scripts
+        # on the page are never materialized or decoded.
         found_json = False
-        scripts = soup.select(SCRIPT_SELECTOR)
-        for script in scripts:
-            try:
-                # Check if script likely contains search results (e.g., look for keywords)
-                if 'searchContent' in script.text:
-                     data = json.loads(script.text)
-                     # Navigate the JSON structure (requires inspection in browser tools)
-                     # This path is HYPOTHETICAL and needs validation
-                     items_data = data.get('searchContent', {}).get('preso', {}).get('items', [])
-                     if items_data:
-                         log.info(f"[Walmart] Found {len(items_data)} items in embedded JSON.")
-                         for item_data in items_data:
-                             try:
-                                 title = item_data.get('title', '').strip()
-                                 # Extract price - structure varies, might be under 'primaryOffer' etc.
-                                 price_info = item_data.get('primaryOffer', {})
-                                 price = self._clean_price(price_info.get('offerPrice') or price_info.get('minPrice'))
-
-                                 link_path = item_data.get('canonicalUrl')
-                                 link = f"https://www.walmart.com{link_path}" if link_path else None
-
-                                 if not title or price is None or not link:
-                                     continue
-
-                                 result = {
-                                     "platform": self.platform_name, "item": search_term,
-                                     "title": title, "price": price,
-                                     "seller_rating": None, "link": link
-                                 }
-                                 if self._apply_filters(result, item):
-                                     results.append(result)
-
-                             except Exception as e:
-                                 log.warning(f"[Walmart] Error processing item from JSON data: {e}")
-                         found_json = True
-                         break # Stop after finding the relevant script
-            except json.JSONDecodeError:
-                continue # Not the JSON we are looking for
-            except Exception as e:
-                log.error(f"[Walmart] Error processing script tag: {e}")
+        page_text = response.text
+        idx = page_text.find('"searchContent"')
+        if idx != -1:
+            start = page_text.rfind('>', 0, idx) + 1 # End of the <script ...> open tag
+            end = page_text.find('</script', idx)
+            if start > 0 and end != -1:
+                try:
+                    data = orjson.loads(page_text[start:end])
+                    found_json = self._collect_json_items(data, search_term, max_price, results)
+                except orjson.JSONDecodeError:
+                    log.debug("[Walmart] Sliced script blob did not parse cleanly. Falling back to tree scan.")
+
+        # Slow path: build the tree and scan the JSON scripts individually
+        if not found_json:
+            tree = self._parse_html(response.content)
+            if not tree:
+                return []
+            scripts = tree.css(SCRIPT_SELECTOR)
+            for script in scripts:
+                try:
+                    # Check if script likely contains search results (e.g., look for keywords)
+                    # deep=False grabs the single text node without walking
+                    # descendants/concatenating — scripts have no child tags
+                    script_text = script.text(deep=False)
+                    if 'searchContent' in script_text:
+                         data = orjson.loads(script_text)
+                         if self._collect_json_items(data, search_term, max_price, results):
+                             found_json = True
+                             break # Stop after finding the relevant script
+                except orjson.JSONDecodeError:
+                    continue # Not the JSON we are looking for
+                except Exception as e:
+                    log.error(f"[Walmart] Error processing script tag: {e}")
 
         # --- Strategy 2: Direct HTML element scraping (fallback if JSON fails) ---
         if not found_json:
             log.warning("[Walmart] Embedded JSON data not found or failed to parse. Falling back to direct HTML scraping (less reliable).")
-            list_items = soup.select(RESULT_ITEM_SELECTOR)
+            list_items = tree.css(RESULT_ITEM_SELECTOR)
             log.info(f"[Walmart] Found {len(list_items)} potential listings via HTML selectors.")
 
             if not list_items and not found_json:
                 log.warning(f"[Walmart] No items found using selector '{RESULT_ITEM_SELECTOR}'. Structure might have changed.")
 
-            for list_item in list_items:
-                try:
-                    title_element = list_item.select_one(TITLE_SELECTOR)
-                    price_element = list_item.select_one(PRICE_SELECTOR) # This might get complex (current, was, unit price)
-                    link_element = list_item.select_one(LINK_SELECTOR)
-
-                    title = title_element.get_text(strip=True) if title_element else "N/A"
-                    link = None
-                    if link_element and link_element.has_attr('href'):
-                         href = link_element['href']
-                         link = f"https://www.walmart.com{href}" if href.startswith('/') else href
-
-                    price = None
-                    if price_element:
-                        # Price extraction needs careful handling of structure (e.g., "$199.99", "$19999")
-                        price_str = price_element.get_text(strip=True)
-                        price = self._clean_price(price_str)
-
-                    if title == "N/A" or price is None or link is None:
-                        log.debug(f"[Walmart] Skipping item due to missing data (HTML scrape): Title={title}, Price={price}, Link={link}")
+            # Guard clauses handle the expected missing-element cases; the
+            # try/except sits outside the loop as a last-resort safety net
+            # rather than paying frame setup per listing
+            try:
+                for list_item in list_items:
+                    price_element = list_item.css_first(PRICE_SELECTOR) # This might get complex (current, was, unit price)
+                    if price_element is None:
                         continue
 
-                    result = {
-                        "platform": self.platform_name, "item": search_term,
-                        "title": title, "price": price,
-                        "seller_rating": None, "link": link
-                    }
+                    # Price extraction needs careful handling of structure (e.g., "$199.99", "$19999")
+                    price = self._clean_price(price_element.text(strip=True))
 
-                    if self._apply_filters(result, item):
-                         results.append(result)
+                    # Price gate before title/link extraction
+                    if price is None or price > max_price:
+                        log.debug(f"[Walmart] Skipping item (price): {price} (Max: {max_price})")
+                        continue
 
-                except Exception as e:
-                    log.warning(f"[Walmart] Error processing a listing item (HTML scrape): {e}", exc_info=False)
-                    continue
+                    title_element = list_item.css_first(TITLE_SELECTOR)
+                    link_element = list_item.css_first(LINK_SELECTOR)
+                    if title_element is None or link_element is None:
+                        continue
+
+                    title = title_element.text(strip=True)
+                    href = link_element.attributes.get('href')
+                    if not title or not href:
+                        log.debug(f"[Walmart] Skipping item due to missing data (HTML scrape): Title={title}, Href={href}")
+                        continue
+                    link = self._BASE_URL + href if href[0] == '/' else href
+
+                    results.append(Listing(
+                        platform=self.platform_name, item=search_term,
+                        title=title, price=price,
+                        seller_rating=None, link=link
+                    ))
+            except Exception as e:
+                log.warning(f"[Walmart] Error processing listing items (HTML scrape): {e}", exc_info=False)
 
         log.info(f"[Walmart] Found {len(results)} relevant listings for '{search_term}' after filtering.")
+        self._store_parsed_results(cache_key, results)
         return results
+
+    def _collect_json_items(self, data, search_term, max_price, results):
+        """Extracts listings from a decoded searchContent blob into results.
+
+        Returns True when the blob held items (the caller can stop
+        scanning scripts), False otherwise.
+        """
+        # Navigate the JSON structure (requires inspection in browser tools)
+        # This path is HYPOTHETICAL and needs validation
+        items_data = data.get('searchContent', {}).get('preso', {}).get('items', [])
+        if not items_data:
+            return False
+
+        log.info(f"[Walmart] Found {len(items_data)} items in embedded JSON.")
+        # Guard-clause validation instead of a per-item try/except: frame
+        # setup is paid once for the whole batch and malformed entries are
+        # skipped with cheap isinstance/None checks
+        try:
+            for item_data in items_data:
+                if not isinstance(item_data, dict):
+                    continue
+
+                # Price gate first: overpriced items skip the
+                # title strip and link string build entirely
+                price_info = item_data.get('primaryOffer')
+                if not isinstance(price_info, dict):
+                    continue
+                raw_price = price_info.get('offerPrice') or price_info.get('minPrice')
+                # JSON prices usually arrive as plain numbers — skip the
+                # regex-stripping path for those
+                if isinstance(raw_price, (int, float)):
+                    price = float(raw_price)
+                else:
+                    price = self._clean_price(raw_price)
+                if price is None or price > max_price:
+                    continue
+
+                title = item_data.get('title', '').strip()
+                link_path = item_data.get('canonicalUrl')
+                link = self._BASE_URL + link_path if link_path else None
+
+                if not title or not link:
+                    continue
+
+                results.append(Listing(
+                    platform=self.platform_name, item=search_term,
+                    title=title, price=price,
+                    seller_rating=None, link=link
+                ))
+        except Exception as e:
+            # Last-resort safety net for structures the guards don't cover
+            log.warning(f"[Walmart] Error processing items from JSON data: {e}")
+        return True
@@ -1,25 +1,81 @@
 import logging
-from thefuzz import fuzz
+import re
+from functools import lru_cache
+
+# RapidFuzz is a drop-in C++/SIMD implementation of the thefuzz scorers;
+# per-call CPU drops by roughly an order of magnitude and it releases the
+# GIL, which matters with scoring running inside worker threads
+from rapidfuzz import fuzz, process
+
+# process.cdist needs numpy to build its score matrix; numpy isn't a
+# project dependency, so the batch path falls back to the memoized
+# scalar scorer when it's unavailable
+try:
+    import numpy # noqa: F401
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
 
 log = logging.getLogger(__name__)
 
+# Deterministic rewrite patterns for search variations, compiled once
+_PAREN_RE = re.compile(r'\([^)]*\)') # Parenthesized suffixes: "(USED)", "(10GB model)"
+_CONDITION_RE = re.compile(r'\b(?:refurbished|renewed|used|pre-owned|open box)\b')
+_EMPTY_PAREN_RE = re.compile(r'\(\s*\)') # Left behind when a paren held only a condition word
+_WS_RE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=4096)
+def _normalize(s):
+    """Cached lowercasing: the same query/title strings recur across
+    platforms and cycles, so the allocation is paid once per string."""
+    return s.lower()
+
+
+@lru_cache(maxsize=16384)
+def _score(a, b, cutoff):
+    """Cached token_set_ratio for a normalized (query, title) pair.
+
+    token_set_ratio is word-order-insensitive, which suits product
+    titles, and score_cutoff lets RapidFuzz abandon the DP early (and
+    return 0) once the score provably falls below the threshold — the
+    cutoff is part of the cache key because it shapes the result.
+    """
+    return fuzz.token_set_ratio(a, b, score_cutoff=cutoff)
+
 def get_search_variations(item_name):
     """
     Generates potential variations of the search term.
-    (Currently very basic - just returns the original name).
-    Future: Could generate synonyms, acronyms, remove/add terms like 'refurbished'.
+
+    Variations are cheap rule-based rewrites: the original name, the name
+    with condition words (refurbished/used/...) stripped, and the name
+    with parenthesized suffixes dropped. Besides improving recall, a
+    literal substring hit on any variation lets relevance checking skip
+    fuzzy scoring entirely.
 
     Args:
         item_name (str): The original item name from input.
 
     Returns:
-        list: A list of search terms (currently just the original).
+        list: Ordered, de-duplicated search terms, original (lowercased)
+              first.
     """
-    # Placeholder for more advanced logic
-    # Example: could split "NVIDIA RTX 3080 refurbished" into
-    # ["NVIDIA RTX 3080 refurbished", "NVIDIA RTX 3080", "RTX 3080 refurbished"]
-    # For now, keep it simple
-    variations = [item_name.lower()] # Use lower case for searching usually
+    base = item_name.lower() # Use lower case for searching usually
+    candidates = [
+        base,
+        _CONDITION_RE.sub(' ', base),
+        _PAREN_RE.sub(' ', base),
+        _PAREN_RE.sub(' ', _CONDITION_RE.sub(' ', base)),
+    ]
+
+    variations = []
+    seen = set()
+    for candidate in candidates:
+        candidate = _WS_RE.sub(' ', _EMPTY_PAREN_RE.sub(' ', candidate)).strip()
+        if candidate and candidate not in seen:
+            seen.add(candidate)
+            variations.append(candidate)
+
     log.debug(f"Generated search variations for '{item_name}': {variations}")
     return variations
 
@@ -38,19 +94,90 @@ def check_title_relevance(original_item_name, result_title, min_ratio=70):
         bool: True if relevant, False otherwise.
     """
     # Normalize strings for better comparison (lowercase, maybe remove common words)
-    norm_original = original_item_name.lower()
-    norm_title = result_title.lower()
+    norm_original = _normalize(original_item_name)
+    norm_title = _normalize(result_title)
+
+    # Fast paths before any fuzzy scoring. Titles that literally contain
+    # the query are the common case and partial_ratio would return 100 for
+    # them anyway; equality is the same check for free.
+    if norm_original == norm_title or norm_original in norm_title:
+        return True
+    # Cheap rejection gate: require at least one query word to appear
+    # literally in the title before paying for the Levenshtein-based
+    # scorer. Zero-overlap pairs are the bulk of noisy result sets and
+    # never score near a useful threshold.
+    if set(norm_original.split()).isdisjoint(norm_title.split()):
+        return False
 
     # Can use different fuzz methods:
     # ratio = fuzz.ratio(norm_original, norm_title) # Simple ratio
-    ratio = fuzz.partial_ratio(norm_original, norm_title) # Good if original is substring of title
+    # ratio = fuzz.partial_ratio(norm_original, norm_title) # Good if original is substring of title
     # ratio = fuzz.token_sort_ratio(norm_original, norm_title) # Ignores word order
-    # ratio = fuzz.token_set_ratio(norm_original, norm_title) # Handles common tokens
+    ratio = _score(norm_original, norm_title, min_ratio) # token_set_ratio: handles common tokens
 
     log.debug(f"Fuzz check: Ratio={ratio} between '{norm_original}' and '{norm_title}' (Min: {min_ratio})")
 
     return ratio >= min_ratio
 
+class QueryScorer:
+    """
+    Scores many titles against one fixed query.
+
+    Normalizing the query and building its token set happen once here
+    instead of once per comparison, so callers checking a whole result
+    page instantiate one scorer per search item and call is_relevant()
+    per listing. Scoring itself goes through the shared memoized _score,
+    so repeated titles across platforms are still only scored once.
+    """
+
+    def __init__(self, query, min_ratio=70):
+        self.query = query
+        self.min_ratio = min_ratio
+        self._norm_query = _normalize(query)
+        self._query_tokens = frozenset(self._norm_query.split())
+
+    def is_relevant(self, title):
+        """Same contract as check_title_relevance for the fixed query."""
+        norm_title = _normalize(title)
+        if self._norm_query == norm_title or self._norm_query in norm_title:
+            return True
+        if self._query_tokens.isdisjoint(norm_title.split()):
+            return False
+        return _score(self._norm_query, norm_title, self.min_ratio) >= self.min_ratio
+
+
+def score_titles_batch(query, titles, min_ratio=70):
+    """
+    Checks one query against many titles in a single batch call.
+
+    With numpy installed, process.cdist computes the whole similarity
+    row in C with SIMD and multi-threading (workers=-1), replacing N
+    GIL-bound per-pair calls with one parallel kernel; score_cutoff
+    lets non-matches bail out early inside the kernel. Without numpy
+    (cdist needs it for its result matrix) the titles are scored one
+    by one through the memoized scorer instead.
+
+    Args:
+        query (str): The name from the input file.
+        titles (list): Titles of found listings.
+        min_ratio (int): The minimum fuzz ratio (0-100) to consider relevant.
+
+    Returns:
+        list: Booleans aligned with titles (True = relevant).
+    """
+    if not titles:
+        return []
+    norm_query = _normalize(query)
+    norm_titles = [_normalize(t) for t in titles]
+    if _HAS_NUMPY:
+        scores = process.cdist([norm_query], norm_titles,
+                               scorer=fuzz.token_set_ratio,
+                               score_cutoff=min_ratio, workers=-1)[0]
+        return [score >= min_ratio for score in scores]
+    return [_score(norm_query, norm_title, min_ratio) >= min_ratio
+            for norm_title in norm_titles]
+
+
 if __name__ == '__main__':
     # Example usage if run directly
     logging.basicConfig(level=logging.DEBUG)